@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+"""This module provides ARBAC engines differential check and benchmark entry script."""
+
+
+import sys
+
+from arbac_analyser.benchmark.differential_check import main
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -4,24 +4,36 @@ Checks the reachability of a goal role in an ARBAC system
 provided as input.
 
 Usage:
-    ./arbac-analyser.py [policy.arbac]
+    ./arbac-analyser.py [--cache cache.json] [--witness] [policy.arbac]
 
 - Pass .arbac file as parameter:
     ./arbac-analyser.py policies/policy1.arbac
 
 - Pass .arbac file content through stdin:
     cat policies/policy1.arbac | ./arbac-analyser.py
+
+- Reuse the results of previous runs, stored in a cache file
+  (the verdict is computed again only if the policy changed in a way
+  that can affect it):
+    ./arbac-analyser.py --cache cache.json policies/policy1.arbac
+
+- Print a shortest sequence of rules that assigns the goal role
+  (the cache, if given, is not used):
+    ./arbac-analyser.py --witness policies/policy1.arbac
 """
 
 
+import os
 import sys
 import typing
-from typing import List
+from typing import Dict, List, Union
 
-from .types.arbac import ArbacReachability
+from .types.arbac import ArbacReachability, CanAssignRule, CanRevokeRule
 from .parser import arbac_parser
+from .cache import analysis_cache
 from .pruning import pruning_algorithms as pruning
-from .reachability import role_reachability as reachability
+from .reachability import decomposed_reachability as reachability
+from .reachability import role_reachability
 
 
 def main(argv: List[str]):
@@ -30,28 +42,54 @@ def main(argv: List[str]):
     Reads .arbac file content from file or stdin, parses it,
     and if no error occurs, runs an ARBAC pruning algorithm
     (a combination of forward and backward slicing algorithms),
-    and then runs the role reachability test.
+    and then runs the role reachability test on the decomposed
+    problem.
+
+    If a cache file is given, the verdict stored in it is reused
+    when the changes to the policy don't affect it.
+    If a witness is requested, the sequence of rules that assigns the goal
+    role is printed, referring to the rules of the input policy.
 
     Args:
         argv: Argument list:
             argv[0]: program name;
-            argv[1]: path to .arbac file (optional).
+            then the options (optional):
+                "--cache" followed by the path to the cache file;
+                "--witness";
+            last: path to .arbac file (optional).
     """
 
-    # handle cli parameters
-    argc = len(argv)
+    usage = f"usage: {argv[0]} [--cache cache.json] [--witness] [policy.arbac]"
 
-    if argc > 2:
+    # handle cli parameters
+    args = argv[1:]
+
+    cache_filename = None
+    witness_mode = False
+    while args and args[0] in ("--cache", "--witness"):
+        if args[0] == "--witness":
+            witness_mode = True
+            args = args[1:]
+        else:
+            if len(args) < 2:
+                # missing cache file
+                print(f"Missing cache file, {usage}", file=sys.stderr)
+                sys.exit(1)
+            cache_filename = args[1]
+            args = args[2:]
+
+    if len(args) > 1:
         # too many parameters
-        print(f"Too many parameters, usage: {argv[0]} [policy.arbac]", file=sys.stderr)
+        print(f"Too many parameters, {usage}", file=sys.stderr)
         sys.exit(1)
 
-    if argc == 1:
+    if not args:
         # read from stdin
+        filename = "<stdin>"
         text = sys.stdin.read()
     else:
         # read from given file
-        filename = argv[1]
+        filename = args[0]
         try:
             with open(filename) as f:
                 text = f.read()
@@ -82,11 +120,76 @@ def main(argv: List[str]):
     # print("Backward sliced ARBAC")
     # print(pruning.backward_slicing(res))
 
-    # slice arbac reachability problem
+    witness = None
+    if witness_mode:
+        # names of the input rules, computed before slicing
+        # (slicing keeps the same rule objects, but may simplify them)
+        rule_names = _rule_names(res)
+
+        # slice arbac reachability problem
+        sliced_arbac_reachability = pruning.slicing(res)
+
+        # verify role reachability, keeping track of the applied rules
+        witness = role_reachability.role_reachability_witness(sliced_arbac_reachability)
+        reachable = witness is not None
+    elif cache_filename is None:
+        # slice arbac reachability problem
+        sliced_arbac_reachability = pruning.slicing(res)
+
+        # verify role reachability, exploring the independent components separately
+        reachable = reachability.decomposed_role_reachability(sliced_arbac_reachability)
+    else:
+        # slice and verify role reachability, unless the cached verdict is still valid
+        # (policies are identified by their canonical path, so that different
+        # paths to the same file share the cache entry)
+        cache_key = filename if not args else os.path.realpath(filename)
+        cache = analysis_cache.load_cache(cache_filename)
+        (sliced_arbac_reachability, reachable, reused) = analysis_cache.cached_analysis(
+            cache, cache_key, res, pruning.slicing, reachability.decomposed_role_reachability
+        )
+        analysis_cache.save_cache(cache_filename, cache)
+
     print("Sliced ARBAC\n")
-    sliced_arbac_reachability = pruning.slicing(res)
     print(sliced_arbac_reachability, "\n")
 
-    # verify role reachability
-    reachable = reachability.role_reachability(sliced_arbac_reachability)
+    if cache_filename is not None and not witness_mode:
+        print(f"Verdicts reused from cache: {1 if reused else 0} of 1\n")
+
+    if witness is not None:
+        print(f"Witness ({len(witness)} steps)\n")
+        for (i, step) in enumerate(witness, start=1):
+            if isinstance(step.rule, CanAssignRule):
+                print(f"{i}. assign {step.rule.target_role} to {step.user} using {rule_names[id(step.rule)]}")
+            else:
+                print(f"{i}. revoke {step.rule.target_role} from {step.user} using {rule_names[id(step.rule)]}")
+        print()
+
     print("Reachable" if reachable else "Not reachable")
+
+
+def _rule_names(arbac_reachability: ArbacReachability) -> Dict[int, str]:
+    """Builds a readable name for each rule of the ARBAC policy.
+
+    The name contains the position of the rule in the policy
+    and the rule itself, in the .arbac syntax.
+
+    Args:
+        arbac_reachability: The ARBAC reachability problem.
+
+    Returns:
+        A dictionary mapping the identity (id) of each rule object to its name.
+    """
+
+    rule_names: Dict[int, str] = {}
+    policy = arbac_reachability.arbac.policy
+
+    rule: Union[CanAssignRule, CanRevokeRule]
+    for (i, rule) in enumerate(policy.can_assign, start=1):
+        conditions = rule.positive_roles + [ f"-{role}" for role in rule.negative_roles ]
+        precondition = "&".join(conditions) if conditions else "TRUE"
+        rule_names[id(rule)] = f"CA #{i} <{rule.admin_role},{precondition},{rule.target_role}>"
+
+    for (i, rule) in enumerate(policy.can_revoke, start=1):
+        rule_names[id(rule)] = f"CR #{i} <{rule.admin_role},{rule.target_role}>"
+
+    return rule_names
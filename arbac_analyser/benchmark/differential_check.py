@@ -0,0 +1,651 @@
+"""ARBAC engines differential check and performance gate.
+
+Runs a corpus of ARBAC reachability problems (.arbac policy files and
+randomly generated small policies, some of them made of independent groups
+of roles, so that they are decomposed) through every combination of
+role reachability engine and pruning algorithm, and:
+- reports any disagreement between the verdicts;
+- appends the time, number of explored states, and peak memory of each run
+  to a history file (one JSON object per line);
+- compares the time of each run with the thresholds stored in a JSON file,
+  reporting the runs that got slower;
+- applies random edits to the random policies, checking that the verdicts
+  reused by the analysis cache (see `arbac_analyser.cache.analysis_cache`)
+  are the same as the ones computed again from scratch.
+
+Each run is executed in a separate process, so that it can be stopped
+when it exceeds the time limit, and its memory usage is measured in isolation
+(from the peak resident set size of the process, without tracing allocations,
+so that the measured time is not affected).
+
+Usage:
+    ./arbac-benchmark.py [options] [policy.arbac ...]
+
+Options:
+    --random N              number of random policies, and of random modular policies,
+                            to add to the corpus (default 50)
+    --seed S                seed of the first random policy (default 0)
+    --engines E1,E2         engines to run (default: all)
+    --prunings P1,P2        pruning algorithms to run (default: all)
+    --timeout SECONDS       time limit of each run (default 10)
+    --cache-edits N         number of successive edits of each random policy
+                            for the cache check (default 10)
+    --history FILE          history file (default benchmark-history.jsonl)
+    --thresholds FILE       thresholds file to check the times against
+    --update-thresholds     store the current times (with a margin) in the thresholds file,
+                            and the runs that exceeded the time limit as expected timeouts
+
+The thresholds file maps "engine+pruning" to an object mapping each policy
+to the maximum allowed time in seconds, or to "timeout" if the run is expected
+to exceed the time limit, e.g.:
+    { "decomposed+slicing": { "policies/policy1.arbac": 1.5, "policies/policy5.arbac": "timeout" } }
+A maximum time longer than --timeout extends the time limit of that run.
+
+A run that exceeds the time limit is a failure only if it has a maximum time
+in the thresholds file; otherwise it is just reported.
+
+Exit status (the first applicable one):
+    1   some verdicts disagree (or a reused verdict differs from the computed one),
+        or some run failed
+    3   some run with a maximum time exceeded the time limit
+    2   some run got slower than its threshold
+    0   everything is fine
+    4   parse error in a policy file
+    5   policy file not found
+    6   invalid command line parameters
+
+This module exports the following:
+- `ENGINES`;
+- `PRUNINGS`;
+- `EXPECTED_TIMEOUT`;
+- `Thresholds`;
+- `random_problem`;
+- `random_modular_problem`;
+- `random_edit`;
+- `run_corpus`;
+- `cache_mismatches`;
+- `disagreements`;
+- `threshold_violations`;
+- `main`.
+"""
+
+
+import copy
+import glob
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from arbac_analyser.types.arbac import (
+    CanAssignRule, CanRevokeRule, UserToRole,
+    UserToRoleAssignment, Arbac, Policy, ArbacReachability, SearchStatistics
+)
+from arbac_analyser.parser import arbac_parser
+from arbac_analyser.cache import analysis_cache
+from arbac_analyser.pruning import pruning_algorithms as pruning
+from arbac_analyser.reachability import role_reachability, decomposed_reachability, reference_reachability
+
+
+# role reachability engines: name -> function(problem, statistics) -> verdict
+# ("reference" evaluates every rule from scratch, independently of the incremental search
+# shared by the other engines)
+ENGINES: Dict[str, Callable[[ArbacReachability, SearchStatistics], bool]] = {
+    "reference": reference_reachability.reference_role_reachability,
+    "bfs": role_reachability.role_reachability,
+    "witness": lambda problem, statistics: (
+        role_reachability.role_reachability_witness(problem, statistics) is not None
+    ),
+    "decomposed": decomposed_reachability.decomposed_role_reachability,
+}
+
+# pruning algorithms: name -> function(problem) -> pruned problem
+PRUNINGS: Dict[str, Callable[[ArbacReachability], ArbacReachability]] = {
+    "none": lambda problem: problem,
+    "forward": pruning.forward_slicing,
+    "backward": pruning.backward_slicing,
+    "slicing": pruning.slicing,
+}
+
+# threshold of the runs expected to exceed the time limit
+EXPECTED_TIMEOUT = "timeout"
+
+# thresholds: "engine+pruning" -> policy -> maximum time in seconds, or EXPECTED_TIMEOUT
+Thresholds = Dict[str, Dict[str, Union[float, str]]]
+
+# margin applied to the measured times when updating the thresholds
+_THRESHOLD_MARGIN = 1.5
+# minimum threshold, to avoid failing because of noise on very fast runs
+_THRESHOLD_MIN = 0.5
+
+
+def random_problem(seed: int) -> ArbacReachability:
+    """Generates a small random ARBAC reachability problem.
+
+    The problems are small enough (at most 5 roles and 3 users)
+    to be solved by every engine, even without pruning.
+
+    Args:
+        seed: The seed of the random generator.
+
+    Returns:
+        The generated ArbacReachability.
+    """
+
+    rng = random.Random(seed)
+
+    roles = [ f"r{i}" for i in range(rng.randint(2, 5)) ]
+    users = [ f"u{i}" for i in range(rng.randint(1, 3)) ]
+
+    user_to_role_assignment = UserToRoleAssignment(frozenset(
+        UserToRole(rng.choice(users), rng.choice(roles)) for _ in range(rng.randint(1, 4))
+    ))
+
+    can_assign = []
+    for _ in range(rng.randint(1, 8)):
+        precondition = rng.sample(roles, rng.randint(0, min(3, len(roles))))
+        positives_count = rng.randint(0, len(precondition))
+        can_assign.append(CanAssignRule(rng.choice(roles),
+                                        precondition[:positives_count],
+                                        precondition[positives_count:],
+                                        rng.choice(roles)))
+
+    can_revoke = [ CanRevokeRule(rng.choice(roles), rng.choice(roles))
+                   for _ in range(rng.randint(0, 4)) ]
+
+    arbac = Arbac(roles, users, user_to_role_assignment, Policy(can_assign, can_revoke))
+    return ArbacReachability(arbac, rng.choice(roles))
+
+
+def random_modular_problem(seed: int) -> ArbacReachability:
+    """Generates a small random ARBAC reachability problem made of independent groups of roles.
+
+    The rules assigning or revoking a role of a group mention only roles
+    of the same group, while the rules assigning the goal mention roles
+    of every group, so that the problem is split by
+    `arbac_analyser.decomposition.policy_decomposition.decompose`
+    (unless some group has no rule that can change it) and solved by
+    the decomposed engine component by component.
+
+    Args:
+        seed: The seed of the random generator.
+
+    Returns:
+        The generated ArbacReachability, with goal role "goal".
+    """
+
+    rng = random.Random(seed)
+
+    users = [ f"u{i}" for i in range(rng.randint(1, 3)) ]
+    groups = [ [ f"g{i}r{j}" for j in range(rng.randint(1, 3)) ] for i in range(rng.randint(2, 3)) ]
+
+    user_roles = set()
+    can_assign = []
+    can_revoke = []
+    for group in groups:
+        for _ in range(rng.randint(1, 2)):
+            user_roles.add(UserToRole(rng.choice(users), rng.choice(group)))
+
+        # rules within the group
+        for _ in range(rng.randint(1, 4)):
+            precondition = rng.sample(group, rng.randint(0, len(group)))
+            positives_count = rng.randint(0, len(precondition))
+            can_assign.append(CanAssignRule(rng.choice(group),
+                                            precondition[:positives_count],
+                                            precondition[positives_count:],
+                                            rng.choice(group)))
+        for _ in range(rng.randint(0, 2)):
+            can_revoke.append(CanRevokeRule(rng.choice(group), rng.choice(group)))
+
+    # rules assigning the goal, with a role of each group
+    # (one of them as admin role, the others as positive or negative roles)
+    for _ in range(rng.randint(1, 3)):
+        precondition = [ rng.choice(group) for group in groups ]
+        admin_role = precondition.pop(rng.randrange(len(precondition)))
+        positives_count = rng.randint(0, len(precondition))
+        can_assign.append(CanAssignRule(admin_role,
+                                        precondition[:positives_count],
+                                        precondition[positives_count:],
+                                        "goal"))
+
+    roles = [ role for group in groups for role in group ] + [ "goal" ]
+    arbac = Arbac(roles, users, UserToRoleAssignment(frozenset(user_roles)),
+                  Policy(can_assign, can_revoke))
+    return ArbacReachability(arbac, "goal")
+
+
+def random_edit(problem: ArbacReachability, rng: random.Random) -> ArbacReachability:
+    """Applies a random edit to the ARBAC reachability problem.
+
+    The edit adds or removes a can assign rule, a can revoke rule,
+    or a user-to-role pair. The roles of the edit are drawn from the roles
+    of the problem and from a role that nothing else depends on,
+    so that some edits touch the roles the goal depends on, and some don't.
+    The users and the goal are never changed.
+
+    Args:
+        problem: The ARBAC reachability problem (not modified).
+        rng: The random generator.
+
+    Returns:
+        The edited ArbacReachability.
+    """
+
+    arbac = problem.arbac
+    roles = list(arbac.role_list) + ([ "unrelated" ] if "unrelated" not in arbac.role_list else [])
+    user_roles = set(arbac.user_to_role_assignment.user_role_list)
+    can_assign = list(arbac.policy.can_assign)
+    can_revoke = list(arbac.policy.can_revoke)
+
+    edit = rng.randrange(6)
+    if edit == 0:
+        precondition = rng.sample(roles, rng.randint(0, min(2, len(roles))))
+        positives_count = rng.randint(0, len(precondition))
+        can_assign.append(CanAssignRule(rng.choice(roles),
+                                        precondition[:positives_count],
+                                        precondition[positives_count:],
+                                        rng.choice(roles)))
+    elif edit == 1 and can_assign:
+        can_assign.pop(rng.randrange(len(can_assign)))
+    elif edit == 2:
+        can_revoke.append(CanRevokeRule(rng.choice(roles), rng.choice(roles)))
+    elif edit == 3 and can_revoke:
+        can_revoke.pop(rng.randrange(len(can_revoke)))
+    elif edit == 4:
+        user_roles.add(UserToRole(rng.choice(arbac.user_list), rng.choice(roles)))
+    elif user_roles:
+        user_roles.remove(rng.choice(sorted(user_roles, key=lambda user_role: (user_role.user, user_role.role))))
+
+    edited_arbac = Arbac(roles, list(arbac.user_list), UserToRoleAssignment(frozenset(user_roles)),
+                         Policy(can_assign, can_revoke))
+    return ArbacReachability(edited_arbac, problem.goal)
+
+
+def run_corpus(corpus: List[Tuple[str, ArbacReachability]],
+               engines: List[str],
+               prunings: List[str],
+               timeout: float,
+               thresholds: Optional[Thresholds] = None) -> List[Dict[str, Any]]:
+    """Runs every problem of the corpus with every engine and pruning algorithm.
+
+    Args:
+        corpus: List of (name, problem) pairs.
+        engines: Names of the engines to run (keys of ENGINES).
+        prunings: Names of the pruning algorithms to run (keys of PRUNINGS).
+        timeout: Time limit of each run, in seconds.
+        thresholds: Thresholds of the runs (optional): a maximum time longer
+            than timeout is used as the time limit of its run.
+
+    Returns:
+        A list of records, one for each run, with keys: "policy", "engine",
+        "pruning", "verdict" (True, False, or None if the run timed out or failed),
+        "status" ("ok", "timeout", or "error"), "time" (seconds), "states",
+        "components" (number of components explored separately, 0 if the problem was not split),
+        and "peak_memory" (growth of the peak resident set size of the run process, in bytes).
+    """
+
+    records = []
+    for (name, problem) in corpus:
+        for pruning_name in prunings:
+            for engine_name in engines:
+                # a run allowed to take longer than the default time limit gets more time
+                threshold = (thresholds or {}).get(f"{engine_name}+{pruning_name}", {}).get(name)
+                run_timeout = max(timeout, threshold) if isinstance(threshold, (int, float)) else timeout
+                record = _run_isolated(problem, engine_name, pruning_name, run_timeout)
+                record.update({ "policy": name, "engine": engine_name, "pruning": pruning_name })
+                records.append(record)
+
+    return records
+
+
+def cache_mismatches(corpus: List[Tuple[str, ArbacReachability]],
+                     edits: int,
+                     seed: int) -> Tuple[int, int, List[Tuple[str, int]]]:
+    """Checks the verdicts reused by the analysis cache against the ones computed from scratch.
+
+    Each problem is analysed through `arbac_analyser.cache.analysis_cache.cached_analysis`,
+    then edited several times in a row (see `random_edit`), and analysed again
+    after each edit: the verdict returned by the cache, reused or not,
+    must be the same as the one of a fresh search on the edited problem.
+
+    Args:
+        corpus: List of (name, problem) pairs (small enough to be solved quickly).
+        edits: Number of successive edits of each problem.
+        seed: The seed of the random generator of the edits.
+
+    Returns:
+        A tuple (checked, reused, mismatches) where:
+        - checked is the number of verdicts checked;
+        - reused is how many of them have been reused from the cache;
+        - mismatches is the list of (name, edit number) of the wrong verdicts.
+    """
+
+    rng = random.Random(seed)
+    solve = role_reachability.role_reachability
+
+    checked = 0
+    reused_count = 0
+    mismatches = []
+    for (name, problem) in corpus:
+        cache: Dict[str, Any] = { "policies": {} }
+        analysis_cache.cached_analysis(cache, name, problem, PRUNINGS["none"], solve)
+
+        for edit_number in range(1, edits + 1):
+            problem = random_edit(problem, rng)
+            (_, reachable, reused) = analysis_cache.cached_analysis(cache, name, problem,
+                                                                    PRUNINGS["none"], solve)
+            checked += 1
+            reused_count += reused
+            if reachable != solve(copy.deepcopy(problem)):
+                mismatches.append((name, edit_number))
+
+    return (checked, reused_count, mismatches)
+
+
+def disagreements(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, bool]]:
+    """Finds the policies whose verdicts differ among the runs.
+
+    Runs that timed out or failed are not considered.
+
+    Args:
+        records: The records returned by `run_corpus`.
+
+    Returns:
+        A dictionary mapping each policy with disagreeing verdicts
+        to the verdict of each "engine+pruning" configuration.
+    """
+
+    verdicts: Dict[str, Dict[str, bool]] = {}
+    for record in records:
+        if record["verdict"] is not None:
+            configuration = f"{record['engine']}+{record['pruning']}"
+            verdicts.setdefault(record["policy"], {})[configuration] = record["verdict"]
+
+    return { policy: policy_verdicts
+             for policy, policy_verdicts in verdicts.items()
+             if len(set(policy_verdicts.values())) > 1 }
+
+
+def threshold_violations(records: List[Dict[str, Any]],
+                         thresholds: Thresholds) -> List[Tuple[str, str, float, float]]:
+    """Finds the runs slower than their threshold.
+
+    A run with a maximum time that timed out is a violation (its time limit
+    is never shorter than its maximum time), while runs without a threshold,
+    or expected to time out, are never violations.
+
+    Args:
+        records: The records returned by `run_corpus`.
+        thresholds: Map from "engine+pruning" to a map from policy to the maximum time
+            (or EXPECTED_TIMEOUT).
+
+    Returns:
+        A list of tuples (configuration, policy, time, threshold).
+    """
+
+    violations = []
+    for record in records:
+        configuration = f"{record['engine']}+{record['pruning']}"
+        threshold = thresholds.get(configuration, {}).get(record["policy"])
+        if threshold is None or threshold == EXPECTED_TIMEOUT:
+            continue
+        if record["status"] == "timeout" or record["time"] > threshold:
+            violations.append((configuration, record["policy"], record["time"], threshold))
+
+    return violations
+
+
+def main(argv: List[str]):
+    """Main: Runs the corpus, checks verdicts and thresholds, and records the history.
+
+    Args:
+        argv: Argument list (see the module documentation).
+    """
+
+    usage = (f"usage: {argv[0]} [--random N] [--seed S] [--engines E1,E2] [--prunings P1,P2] "
+             "[--timeout SECONDS] [--cache-edits N] [--history FILE] [--thresholds FILE] [--update-thresholds] "
+             "[policy.arbac ...]")
+
+    # handle cli parameters
+    options: Dict[str, str] = {}
+    update_thresholds = False
+    filenames: List[str] = []
+    args = argv[1:]
+    while args:
+        if args[0] == "--update-thresholds":
+            update_thresholds = True
+            args = args[1:]
+        elif args[0] in ("--random", "--seed", "--engines", "--prunings",
+                         "--timeout", "--cache-edits", "--history", "--thresholds"):
+            if len(args) < 2:
+                print(f"Missing value for {args[0]}, {usage}", file=sys.stderr)
+                sys.exit(6)
+            options[args[0]] = args[1]
+            args = args[2:]
+        elif args[0].startswith("--"):
+            print(f"Unknown option {args[0]}, {usage}", file=sys.stderr)
+            sys.exit(6)
+        else:
+            filenames.append(args[0])
+            args = args[1:]
+
+    try:
+        random_count = int(options.get("--random", "50"))
+        seed = int(options.get("--seed", "0"))
+        timeout = float(options.get("--timeout", "10"))
+        cache_edits = int(options.get("--cache-edits", "10"))
+    except ValueError:
+        print(f"Invalid numeric value, {usage}", file=sys.stderr)
+        sys.exit(6)
+
+    engines = options["--engines"].split(",") if "--engines" in options else list(ENGINES)
+    prunings = options["--prunings"].split(",") if "--prunings" in options else list(PRUNINGS)
+    unknown = [ name for name in engines if name not in ENGINES ] + \
+              [ name for name in prunings if name not in PRUNINGS ]
+    if unknown:
+        print(f"Unknown engines or prunings: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(6)
+
+    history_filename = options.get("--history", "benchmark-history.jsonl")
+    thresholds_filename = options.get("--thresholds")
+    if update_thresholds and thresholds_filename is None:
+        print(f"--update-thresholds requires --thresholds, {usage}", file=sys.stderr)
+        sys.exit(6)
+
+    # build the corpus
+    if not filenames:
+        filenames = sorted(glob.glob("policies/*.arbac")) + sorted(glob.glob("policies/others/*.arbac"))
+
+    corpus: List[Tuple[str, ArbacReachability]] = []
+    for filename in filenames:
+        try:
+            with open(filename) as f:
+                text = f.read()
+        except FileNotFoundError:
+            print(f"File {filename} not found", file=sys.stderr)
+            sys.exit(5)
+
+        err, res = arbac_parser.parse(text)
+        if err:
+            print(f"Parse error in {filename}", file=sys.stderr)
+            print(res, file=sys.stderr)
+            sys.exit(4)
+        corpus.append((filename, res))
+
+    random_corpus = [ (f"random-{i}", random_problem(i)) for i in range(seed, seed + random_count) ] + \
+                    [ (f"random-modular-{i}", random_modular_problem(i)) for i in range(seed, seed + random_count) ]
+    corpus.extend(random_corpus)
+
+    # load the thresholds
+    thresholds: Thresholds = {}
+    if thresholds_filename is not None:
+        try:
+            with open(thresholds_filename) as f:
+                thresholds = json.load(f)
+        except FileNotFoundError:
+            thresholds = {}
+
+    # run the corpus
+    records = run_corpus(corpus, engines, prunings, timeout, thresholds)
+
+    # append the records to the history file
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(history_filename, "a") as f:
+        for record in records:
+            f.write(json.dumps(dict(record, timestamp=timestamp), sort_keys=True) + "\n")
+
+    # summary of each configuration
+    for engine_name in engines:
+        for pruning_name in prunings:
+            runs = [ record for record in records
+                     if record["engine"] == engine_name and record["pruning"] == pruning_name ]
+            timeouts = sum(1 for record in runs if record["status"] == "timeout")
+            errors = sum(1 for record in runs if record["status"] == "error")
+            split = sum(1 for record in runs if record.get("components"))
+            total_time = sum(record["time"] for record in runs)
+            print(f"{engine_name}+{pruning_name}: {len(runs)} runs, {total_time:.2f}s, "
+                  f"{timeouts} timeouts, {errors} errors, {split} decomposed")
+
+    exit_code = 0
+
+    # check failed runs
+    for record in records:
+        if record["status"] == "error":
+            print(f"Error: {record['engine']}+{record['pruning']} on {record['policy']}: "
+                  f"{record.get('error', 'process died')}", file=sys.stderr)
+            exit_code = 1
+
+    # check verdicts agreement
+    disagreeing = disagreements(records)
+    for policy, policy_verdicts in disagreeing.items():
+        print(f"Verdict disagreement on {policy}: {policy_verdicts}", file=sys.stderr)
+    if disagreeing:
+        exit_code = 1
+
+    # check the verdicts reused by the analysis cache
+    (checked, reused, mismatches) = cache_mismatches(random_corpus, cache_edits, seed)
+    print(f"cache: {checked} edited policies, {reused} verdicts reused, {len(mismatches)} mismatches")
+    for (policy, edit_number) in mismatches:
+        print(f"Cache mismatch on {policy} after edit {edit_number}", file=sys.stderr)
+    if mismatches:
+        exit_code = 1
+
+    # update the thresholds
+    if update_thresholds:
+        for record in records:
+            configuration = f"{record['engine']}+{record['pruning']}"
+            if record["status"] == "ok":
+                thresholds.setdefault(configuration, {})[record["policy"]] = round(
+                    max(record["time"] * _THRESHOLD_MARGIN, _THRESHOLD_MIN), 3
+                )
+            elif record["status"] == "timeout":
+                thresholds.setdefault(configuration, {})[record["policy"]] = EXPECTED_TIMEOUT
+        with open(thresholds_filename, "w") as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+
+    # check the thresholds (just updated ones are trivially met)
+    violations = threshold_violations(records, thresholds) if not update_thresholds else []
+    for (configuration, policy, elapsed, threshold) in violations:
+        print(f"Too slow: {configuration} on {policy}: {elapsed:.3f}s > {threshold:.3f}s",
+              file=sys.stderr)
+
+    # runs that exceeded the time limit fail only if they had a maximum time
+    violating = set((configuration, policy) for (configuration, policy, _, _) in violations)
+    for record in records:
+        configuration = f"{record['engine']}+{record['pruning']}"
+        if record["status"] != "timeout":
+            continue
+        if (configuration, record["policy"]) in violating:
+            if exit_code == 0:
+                exit_code = 3
+        else:
+            print(f"Timeout (not a failure): {configuration} on {record['policy']}: "
+                  f"more than {record['time']:.3f}s", file=sys.stderr)
+
+    if violations and exit_code == 0:
+        exit_code = 2
+
+    sys.exit(exit_code)
+
+
+def _run_isolated(problem: ArbacReachability, engine_name: str, pruning_name: str,
+                  timeout: float) -> Dict[str, Any]:
+    """Runs a single engine and pruning algorithm on the problem, in a separate process.
+
+    Args:
+        problem: The ARBAC reachability problem.
+        engine_name: Name of the engine.
+        pruning_name: Name of the pruning algorithm.
+        timeout: Time limit, in seconds.
+
+    Returns:
+        A record with keys "verdict", "status", "time", "states", "components", and "peak_memory".
+    """
+
+    (receiver, sender) = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_single,
+                                      args=(sender, problem, engine_name, pruning_name))
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+
+    record: Optional[Dict[str, Any]] = None
+    if receiver.poll(timeout):
+        try:
+            record = receiver.recv()
+        except EOFError:
+            # the process died without sending its result
+            record = None
+    else:
+        # time limit exceeded
+        process.terminate()
+        process.join()
+        return { "verdict": None, "status": "timeout", "time": timeout,
+                 "states": None, "components": None, "peak_memory": None }
+
+    process.join()
+    if record is None:
+        return { "verdict": None, "status": "error", "time": time.perf_counter() - start,
+                 "states": None, "components": None, "peak_memory": None }
+
+    return record
+
+
+def _run_single(sender, problem: ArbacReachability, engine_name: str, pruning_name: str):
+    """Runs a single engine and pruning algorithm on the problem, sending back the record.
+
+    Executed in a child process by `_run_isolated`.
+
+    Args:
+        sender: Connection where the result record is sent.
+        problem: The ARBAC reachability problem.
+        engine_name: Name of the engine.
+        pruning_name: Name of the pruning algorithm.
+    """
+
+    statistics = SearchStatistics()
+    try:
+        # the peak memory is measured from the resident set size of the process,
+        # since tracing the allocations would slow down the timed run
+        initial_max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        # pruning algorithms may change the problem in place
+        pruned_problem = PRUNINGS[pruning_name](copy.deepcopy(problem))
+        verdict = ENGINES[engine_name](pruned_problem, statistics)
+        elapsed = time.perf_counter() - start
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+        peak_memory = (max_rss - initial_max_rss) * (1 if sys.platform == "darwin" else 1024)
+        record = { "verdict": verdict, "status": "ok", "time": elapsed,
+                   "states": statistics.explored_states, "components": statistics.components,
+                   "peak_memory": peak_memory }
+    except Exception as e:
+        record = { "verdict": None, "status": "error", "time": 0.0,
+                   "states": statistics.explored_states, "components": statistics.components,
+                   "peak_memory": None, "error": repr(e) }
+
+    sender.send(record)
+    sender.close()
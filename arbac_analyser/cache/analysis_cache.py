@@ -0,0 +1,229 @@
+"""ARBAC analysis cache.
+
+Stores, for each analysed policy, its last version together with the
+slicing result and the verdict of each goal, and the roles each verdict
+depends on (the roles the goal transitively depends on, see
+`arbac_analyser.decomposition.policy_decomposition.goal_dependencies`).
+When a new version of the policy is analysed, it is compared with the
+cached one, and only the goals whose dependencies are touched by the change
+are verified again.
+
+The cache is stored as a JSON file.
+
+This module exports 3 functions:
+- `load_cache`;
+- `save_cache`;
+- `cached_analysis`.
+
+    Typical usage example:
+
+    cache = load_cache("cache.json")
+    sliced, reachable, reused = cached_analysis(cache, "policy1.arbac", arbac_reachability,
+                                                slicing, role_reachability)
+    save_cache("cache.json", cache)
+"""
+
+
+import copy
+import json
+from typing import Any, Callable, Dict, Set, Tuple
+
+from arbac_analyser.types.arbac import (
+    CanAssignRule, CanRevokeRule, UserToRole,
+    UserToRoleAssignment, Arbac, Policy, ArbacReachability
+)
+from arbac_analyser.decomposition.policy_decomposition import dependency_graph, goal_dependencies
+
+
+def load_cache(filename: str) -> Dict[str, Any]:
+    """Loads the analysis cache from a JSON file.
+
+    Args:
+        filename: Path of the cache file.
+
+    Returns:
+        The cache content, or an empty cache if the file doesn't exist
+        or is not a valid cache file.
+    """
+
+    try:
+        with open(filename) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return { "policies": {} }
+
+    if not isinstance(cache, dict) or not isinstance(cache.get("policies"), dict):
+        return { "policies": {} }
+
+    return cache
+
+
+def save_cache(filename: str, cache: Dict[str, Any]):
+    """Saves the analysis cache to a JSON file.
+
+    Args:
+        filename: Path of the cache file.
+        cache: The cache content.
+    """
+
+    with open(filename, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def cached_analysis(cache: Dict[str, Any],
+                    key: str,
+                    arbac_reachability: ArbacReachability,
+                    prune: Callable[[ArbacReachability], ArbacReachability],
+                    solve: Callable[[ArbacReachability], bool]) -> Tuple[ArbacReachability, bool, bool]:
+    """Analyses the ARBAC reachability problem, reusing the cached result if possible.
+
+    The cached verdict of the goal is reused if the changes between the
+    cached version of the policy and the new one don't touch any role
+    the verdict depends on (no rule assigning or revoking one of those roles,
+    and no user-to-role pair with one of those roles, has been added or removed),
+    and the users of the system are the same.
+    The cache is updated with the new version of the policy.
+
+    Args:
+        cache: The cache content, as returned by `load_cache` (updated in place).
+        key: Identifier of the policy (e.g. the canonical path of its file).
+        arbac_reachability: The ARBAC reachability problem instance to analyse.
+        prune: The pruning algorithm.
+        solve: The role reachability algorithm (applied to the pruned problem).
+
+    Returns:
+        A tuple (sliced, reachable, reused) where:
+        - sliced is the pruned ArbacReachability;
+        - reachable is the verdict of the role reachability problem;
+        - reused is a boolean indicating whether the verdict has been reused
+            from the cache (True) or computed again (False).
+    """
+
+    goal = arbac_reachability.goal
+
+    # serialize the problem before pruning it
+    # (pruning algorithms may change the rules in place)
+    policy = _serialize(arbac_reachability)
+
+    # diff the new version against the cached one,
+    # and keep only the verdicts whose dependencies are not touched by the change
+    # (a malformed cache entry is treated as a cache miss)
+    goals: Dict[str, Any] = {}
+    cached_policy_entry = cache["policies"].get(key)
+    if cached_policy_entry is not None:
+        try:
+            (users_changed, changed_roles) = _diff(cached_policy_entry["policy"], policy)
+            if not users_changed:
+                goals = { cached_goal: entry
+                          for cached_goal, entry in cached_policy_entry["goals"].items()
+                          if not changed_roles.intersection(entry["relevant_roles"]) }
+        except (KeyError, TypeError, ValueError, AttributeError):
+            goals = {}
+
+    # store the new version of the policy
+    cache["policies"][key] = { "policy": policy, "goals": goals }
+
+    # reuse the verdict, if still valid
+    if goal in goals:
+        try:
+            return (_deserialize(goals[goal]["sliced"]), bool(goals[goal]["reachable"]), True)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            del goals[goal]
+
+    # roles the verdict depends on
+    relevant_roles = goal_dependencies(dependency_graph(arbac_reachability.arbac), goal)
+
+    # analyse the problem
+    sliced_arbac_reachability = prune(copy.deepcopy(arbac_reachability))
+    reachable = solve(sliced_arbac_reachability)
+
+    goals[goal] = {
+        "relevant_roles": sorted(relevant_roles),
+        "sliced": _serialize(sliced_arbac_reachability),
+        "reachable": reachable,
+    }
+
+    return (sliced_arbac_reachability, reachable, False)
+
+
+def _diff(old_policy: Dict[str, Any], new_policy: Dict[str, Any]) -> Tuple[bool, Set[str]]:
+    """Computes the difference between two versions of a serialized ARBAC problem.
+
+    Args:
+        old_policy: The old version, as returned by `_serialize`.
+        new_policy: The new version, as returned by `_serialize`.
+
+    Returns:
+        A tuple (users_changed, changed_roles) where:
+        - users_changed is a boolean indicating whether the set of users changed;
+        - changed_roles is the set of roles assigned or revoked by an added
+            or removed rule, or appearing in an added or removed user-to-role pair.
+    """
+
+    users_changed = set(old_policy["users"]) != set(new_policy["users"])
+
+    changed_roles: Set[str] = set()
+
+    # user-to-role pairs added or removed
+    old_ua = set(tuple(user_role) for user_role in old_policy["ua"])
+    new_ua = set(tuple(user_role) for user_role in new_policy["ua"])
+    changed_roles.update(role for (_, role) in old_ua ^ new_ua)
+
+    # can assign rules added or removed
+    to_hashable = lambda rule: (rule[0], tuple(sorted(rule[1])), tuple(sorted(rule[2])), rule[3])
+    old_ca = set(to_hashable(rule) for rule in old_policy["ca"])
+    new_ca = set(to_hashable(rule) for rule in new_policy["ca"])
+    changed_roles.update(rule[3] for rule in old_ca ^ new_ca)
+
+    # can revoke rules added or removed
+    old_cr = set(tuple(rule) for rule in old_policy["cr"])
+    new_cr = set(tuple(rule) for rule in new_policy["cr"])
+    changed_roles.update(rule[1] for rule in old_cr ^ new_cr)
+
+    return (users_changed, changed_roles)
+
+
+def _serialize(arbac_reachability: ArbacReachability) -> Dict[str, Any]:
+    """Converts the ARBAC reachability problem to a JSON serializable dictionary.
+
+    Args:
+        arbac_reachability: The ARBAC reachability problem.
+
+    Returns:
+        A dictionary representing the problem.
+    """
+
+    arbac = arbac_reachability.arbac
+    return {
+        "roles": list(arbac.role_list),
+        "users": list(arbac.user_list),
+        "ua": sorted([ user_role.user, user_role.role ]
+                     for user_role in arbac.user_to_role_assignment.user_role_list),
+        "cr": [ [ rule.admin_role, rule.target_role ] for rule in arbac.policy.can_revoke ],
+        "ca": [ [ rule.admin_role, list(rule.positive_roles), list(rule.negative_roles), rule.target_role ]
+                for rule in arbac.policy.can_assign ],
+        "goal": arbac_reachability.goal,
+    }
+
+
+def _deserialize(policy: Dict[str, Any]) -> ArbacReachability:
+    """Converts a dictionary returned by `_serialize` back to an ARBAC reachability problem.
+
+    Args:
+        policy: The dictionary representing the problem.
+
+    Returns:
+        The ArbacReachability object.
+    """
+
+    user_to_role_assignment = UserToRoleAssignment(frozenset(
+        UserToRole(user, role) for (user, role) in policy["ua"]
+    ))
+    can_assign = [ CanAssignRule(admin_role, list(positive_roles), list(negative_roles), target_role)
+                   for (admin_role, positive_roles, negative_roles, target_role) in policy["ca"] ]
+    can_revoke = [ CanRevokeRule(admin_role, target_role) for (admin_role, target_role) in policy["cr"] ]
+    arbac = Arbac(list(policy["roles"]),
+                  list(policy["users"]),
+                  user_to_role_assignment,
+                  Policy(can_assign, can_revoke))
+    return ArbacReachability(arbac, policy["goal"])
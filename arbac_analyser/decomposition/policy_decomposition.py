@@ -0,0 +1,294 @@
+"""ARBAC policy decomposition.
+
+The roles of an ARBAC system are linked by a dependency relation:
+a role depends on all the roles mentioned by the rules that assign
+or revoke it (admin, positive, and negative roles).
+Roles that do not (transitively) depend on each other evolve independently,
+so the role reachability problem can be split into smaller independent
+sub-problems, turning the exploration of a product of state spaces
+into the exploration of each state space separately.
+The split is done by weakly connected components, below the goal role;
+strongly connected components only detect a goal lying on a dependency cycle.
+
+This module exports 4 functions:
+- `dependency_graph`;
+- `strongly_connected_components`;
+- `goal_dependencies`;
+- `decompose`.
+
+    Typical usage example:
+
+    arbac_reachability = ArbacReachability(...)
+
+    graph = dependency_graph(arbac_reachability.arbac)
+    sccs = strongly_connected_components(graph)
+    relevant_roles = goal_dependencies(graph, arbac_reachability.goal)
+    decomposition = decompose(arbac_reachability)
+"""
+
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from arbac_analyser.types.arbac import (
+    CanAssignRule, UserToRoleAssignment, Arbac, Policy, ArbacReachability
+)
+
+
+@dataclass
+class Decomposition:
+    """Decomposition of an ARBAC reachability problem into independent sub-systems.
+
+    The goal role is assigned for the first time by one of the goal_rules,
+    whose preconditions are evaluated on the state of the components.
+    Each component is an ARBAC system closed under the dependency relation,
+    and it does not share any role with the other components, so its
+    reachable user-to-role assignments can be computed in isolation.
+
+    Attributes:
+        goal_rules: Can assign rules that can assign the goal role
+            to a user who doesn't have it yet.
+        components: List of independent ARBAC sub-systems.
+        role_component: Map from each role of the components to the index
+            of the component that contains it.
+    """
+
+    goal_rules: List[CanAssignRule]
+    components: List[Arbac]
+    role_component: Dict[str, int]
+
+
+def dependency_graph(arbac: Arbac) -> Dict[str, Set[str]]:
+    """Builds the role dependency graph of the ARBAC system.
+
+    There is an edge from role r1 to role r2 if r2 is mentioned
+    (as admin, positive, or negative role) in a can assign rule
+    whose target is r1, or if r2 is the admin role of a can revoke
+    rule whose target is r1.
+
+    Args:
+        arbac: The ARBAC system.
+
+    Returns:
+        A dictionary mapping each role to the set of roles it depends on.
+    """
+
+    # every role of the system is a node of the graph
+    graph: Dict[str, Set[str]] = { role: set() for role in arbac.role_list }
+
+    # the target of a can assign rule depends on all the roles in the rule
+    for rule in arbac.policy.can_assign:
+        dependencies = graph.setdefault(rule.target_role, set())
+        dependencies.add(rule.admin_role)
+        dependencies.update(rule.positive_roles)
+        dependencies.update(rule.negative_roles)
+
+    # the target of a can revoke rule depends on the rule admin role
+    for rule in arbac.policy.can_revoke:
+        graph.setdefault(rule.target_role, set()).add(rule.admin_role)
+
+    # make sure every mentioned role is a node of the graph
+    for dependencies in list(graph.values()):
+        for role in dependencies:
+            graph.setdefault(role, set())
+
+    return graph
+
+
+def strongly_connected_components(graph: Dict[str, Set[str]]) -> List[Set[str]]:
+    """Computes the strongly connected components of the graph.
+
+    Uses an iterative version of Tarjan's algorithm, so that long
+    dependency chains don't hit the recursion limit.
+
+    Args:
+        graph: Dictionary mapping each node to the set of its successors.
+
+    Returns:
+        The list of the strongly connected components, in reverse topological
+        order (each component comes after all the components it depends on).
+    """
+
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[Set[str]] = []
+
+    # sorted to make the result deterministic
+    for root in sorted(graph):
+        if root in index:
+            continue
+
+        # explicit call stack of (node, iterator over its successors)
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        call_stack = [ (root, iter(sorted(graph[root]))) ]
+
+        while call_stack:
+            node, successors = call_stack[-1]
+
+            # visit the next unvisited successor, if any
+            descended = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    call_stack.append((successor, iter(sorted(graph[successor]))))
+                    descended = True
+                    break
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+
+            if descended:
+                continue
+
+            # all the successors have been visited: node is done
+            call_stack.pop()
+            if call_stack:
+                parent = call_stack[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            # node is the root of a component: pop it from the stack
+            if lowlink[node] == index[node]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def goal_dependencies(graph: Dict[str, Set[str]], goal: str) -> Set[str]:
+    """Computes the roles the goal (transitively) depends on.
+
+    The answer to the role reachability problem depends only on these roles,
+    on the rules that assign or revoke them, and on the users of the system.
+
+    Args:
+        graph: The role dependency graph, as returned by `dependency_graph`.
+        goal: The goal role.
+
+    Returns:
+        The set of roles reachable from the goal in the dependency graph,
+        including the goal itself.
+    """
+
+    relevant_roles = set([ goal ])
+    to_visit = [ goal ]
+    while to_visit:
+        role = to_visit.pop()
+        for dependency in graph.get(role, set()):
+            if dependency not in relevant_roles:
+                relevant_roles.add(dependency)
+                to_visit.append(dependency)
+
+    return relevant_roles
+
+
+def decompose(arbac_reachability: ArbacReachability) -> Optional[Decomposition]:
+    """Decomposes the ARBAC reachability problem into independent sub-systems.
+
+    Only the roles the goal (transitively) depends on are kept.
+    If the goal role is not part of a dependency cycle, the roles below it
+    are split into the weakly connected components of the dependency graph:
+    each of them is closed under the dependency relation, so it can be
+    explored on its own, and the preconditions of the rules assigning the goal
+    can be checked separately on each component.
+
+    The strongly connected components are used only to detect whether the goal
+    lies on a dependency cycle: the roles below the goal are not solved layer
+    by layer along the SCC graph. Revocations and negative preconditions make
+    the evolution of a lower layer non-monotonic, so the preconditions of an
+    upper layer must hold on the lower layers at the same time, and the reachable
+    states of two layers can't be combined freely. Only components that share
+    no roles, and don't depend on each other, can be.
+
+    Args:
+        arbac_reachability: The ARBAC reachability problem instance to decompose.
+
+    Returns:
+        The Decomposition of the problem, or None if the goal role belongs
+        to a dependency cycle (in which case the problem can't be split).
+    """
+
+    arbac = arbac_reachability.arbac
+    goal = arbac_reachability.goal
+    graph = dependency_graph(arbac)
+
+    # roles the goal (transitively) depends on
+    relevant_roles = goal_dependencies(graph, goal)
+
+    relevant_graph = { role: graph.get(role, set()) & relevant_roles for role in relevant_roles }
+
+    # the goal must be alone in its strongly connected component,
+    # otherwise its assignment interleaves with the evolution of the roles below it
+    goal_component = next(component
+                          for component in strongly_connected_components(relevant_graph)
+                          if goal in component)
+    if len(goal_component) > 1:
+        return None
+
+    # can assign rules that can assign the goal to a user who doesn't have it yet:
+    # rules that require the goal (as admin or positive role) can only fire
+    # after the goal has already been reached, so they can be ignored,
+    # while a negative goal is always satisfied before the goal is reached
+    goal_rules = [ CanAssignRule(rule.admin_role,
+                                 list(rule.positive_roles),
+                                 [ role for role in rule.negative_roles if role != goal ],
+                                 goal)
+                   for rule in arbac.policy.can_assign
+                   if rule.target_role == goal
+                   and rule.admin_role != goal
+                   and goal not in rule.positive_roles ]
+
+    # split the roles below the goal into weakly connected components
+    lower_roles = relevant_roles - set([ goal ])
+    undirected_graph: Dict[str, Set[str]] = { role: set() for role in lower_roles }
+    for role in lower_roles:
+        for dependency in relevant_graph[role]:
+            undirected_graph[role].add(dependency)
+            undirected_graph[dependency].add(role)
+
+    role_component: Dict[str, int] = {}
+    components_count = 0
+    for root in sorted(lower_roles):
+        if root in role_component:
+            continue
+        component_index = components_count
+        components_count += 1
+        role_component[root] = component_index
+        to_visit = [ root ]
+        while to_visit:
+            role = to_visit.pop()
+            for neighbour in undirected_graph[role]:
+                if neighbour not in role_component:
+                    role_component[neighbour] = component_index
+                    to_visit.append(neighbour)
+
+    # build an ARBAC sub-system for each component
+    component_roles: List[List[str]] = [ [] for _ in range(components_count) ]
+    for role in sorted(role_component):
+        component_roles[role_component[role]].append(role)
+
+    components = []
+    for roles in component_roles:
+        roles_set = set(roles)
+        user_to_role_assignment = UserToRoleAssignment(frozenset(
+            user_role for user_role in arbac.user_to_role_assignment.user_role_list
+            if user_role.role in roles_set
+        ))
+        can_assign = [ rule for rule in arbac.policy.can_assign if rule.target_role in roles_set ]
+        can_revoke = [ rule for rule in arbac.policy.can_revoke if rule.target_role in roles_set ]
+        components.append(Arbac(roles,
+                                arbac.user_list,
+                                user_to_role_assignment,
+                                Policy(can_assign, can_revoke)))
+
+    return Decomposition(goal_rules, components, role_component)
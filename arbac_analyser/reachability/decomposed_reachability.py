@@ -0,0 +1,257 @@
+"""ARBAC role reachability on a decomposed policy.
+
+The ARBAC reachability problem is decomposed into independent sub-systems
+(see `arbac_analyser.decomposition.policy_decomposition`), whose state spaces
+are explored separately, and the preconditions of the rules assigning the goal
+are checked component by component.
+When the decomposition is not possible, it falls back to the exploration
+of the whole state space.
+
+This module exports only one function, `decomposed_role_reachability`.
+
+    Typical usage example:
+
+    arbac_reachability = ArbacReachability(...)
+    reachable = decomposed_role_reachability(arbac_reachability)
+    print("Reachable" if reachable else "Not reachable")
+"""
+
+
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from arbac_analyser.types.arbac import Arbac, ArbacReachability, UserToRoleAssignment, SearchStatistics
+from arbac_analyser.decomposition.policy_decomposition import decompose
+from arbac_analyser.reachability.role_reachability import role_reachability, reachable_assignments
+
+
+# condition on the state of a single component:
+# (admin role, or None if no admin role is required, target user, positive roles, negative roles)
+_Condition = Tuple[Optional[str], str, FrozenSet[str], FrozenSet[str]]
+
+
+class _ComponentStateSpace:
+    """Lazily explored state space of an ARBAC component.
+
+    The reachable user-to-role assignments are generated one at a time,
+    and each of them is checked against the conditions on the component
+    that are not satisfied yet, so the exploration is shared by all the
+    rules and users.
+    Pending conditions are indexed by one of the user-to-role pairs (or admin roles)
+    they require, so that each state is checked only against the conditions
+    it can possibly satisfy.
+
+    Attributes:
+        pending: Number of conditions not satisfied by any state generated so far.
+        exhausted: True if all the reachable states have been generated.
+    """
+
+    def __init__(self, arbac: Arbac, statistics: Optional[SearchStatistics]):
+        self.pending = 0
+        self.exhausted = False
+        self.__assignments: Iterator[UserToRoleAssignment] = reachable_assignments(arbac, statistics)
+        # pending conditions requiring a positive role, indexed by (user, one of the positive roles)
+        self.__by_user_role: Dict[Tuple[str, str], Set[_Condition]] = {}
+        # pending conditions without positive roles, requiring an admin role, indexed by admin role
+        self.__by_admin: Dict[str, Set[_Condition]] = {}
+        # pending conditions with only negative roles
+        self.__unindexed: Set[_Condition] = set()
+
+    def add(self, condition: _Condition):
+        """Adds a condition to check on the states generated from now on.
+
+        Args:
+            condition: The condition to check.
+        """
+
+        (admin_role, user, positive_roles, _) = condition
+        if positive_roles:
+            self.__by_user_role.setdefault((user, min(positive_roles)), set()).add(condition)
+        elif admin_role is not None:
+            self.__by_admin.setdefault(admin_role, set()).add(condition)
+        else:
+            self.__unindexed.add(condition)
+        self.pending += 1
+
+    def step(self) -> List[_Condition]:
+        """Generates the next reachable state, and checks the pending conditions on it.
+
+        Returns:
+            The pending conditions satisfied by the new state
+            (they are no longer pending).
+        """
+
+        user_to_role_assignment = next(self.__assignments, None)
+        if user_to_role_assignment is None:
+            self.exhausted = True
+            return []
+
+        # candidate conditions: the ones indexed by a pair or an admin role of the state
+        candidates: List[Set[_Condition]] = [ self.__unindexed ] if self.__unindexed else []
+        for user_role in user_to_role_assignment.user_role_list:
+            conditions = self.__by_user_role.get((user_role.user, user_role.role))
+            if conditions:
+                candidates.append(conditions)
+        if self.__by_admin:
+            for role in set(user_role.role for user_role in user_to_role_assignment.user_role_list):
+                conditions = self.__by_admin.get(role)
+                if conditions:
+                    candidates.append(conditions)
+
+        # no pending condition can be satisfied by the state
+        if not candidates:
+            return []
+
+        state = _to_state(user_to_role_assignment)
+        newly_satisfied = []
+        for conditions in candidates:
+            satisfied = [ condition for condition in conditions if _satisfies(state, condition) ]
+            conditions.difference_update(satisfied)
+            newly_satisfied.extend(satisfied)
+
+        self.pending -= len(newly_satisfied)
+        return newly_satisfied
+
+
+def decomposed_role_reachability(arbac_reachability: ArbacReachability,
+                                 statistics: Optional[SearchStatistics] = None) -> bool:
+    """Solves the given ARBAC role reachability problem, decomposing it.
+
+    The goal is reachable if there is a rule assigning it, and a user,
+    such that every component has a reachable state satisfying the part
+    of the rule preconditions that concerns its roles.
+    Since the components are independent, their reachable states
+    can be freely combined.
+    The components are explored in a round-robin fashion, one state at a time,
+    so that the search stops as soon as a rule can fire for some user.
+
+    Args:
+        arbac_reachability: The ARBAC role reachability problem.
+        statistics: Statistics updated during the search (optional),
+            counting the states explored in all the components,
+            and the components explored separately.
+
+    Returns:
+        A boolean indicating whether the goal role is reachable
+        from the initial user-to-role assignment, using the given
+        policy.
+    """
+
+    arbac = arbac_reachability.arbac
+    goal = arbac_reachability.goal
+
+    # goal already assigned in the initial user-to-role assignment
+    if any(user_role.role == goal for user_role in arbac.user_to_role_assignment.user_role_list):
+        return True
+
+    decomposition = decompose(arbac_reachability)
+
+    # components whose user-to-role assignment can change
+    dynamic_components = [ component for component in decomposition.components
+                           if component.policy.can_assign or component.policy.can_revoke ] \
+                         if decomposition is not None else []
+
+    if len(dynamic_components) < 2:
+        # the problem can't be decomposed, or the decomposition doesn't reduce
+        # the state space (at most one component can change):
+        # explore the whole state space
+        return role_reachability(arbac_reachability, statistics)
+
+    if statistics is not None:
+        statistics.components = len(decomposition.components)
+
+    # state spaces of the components, shared by all the rules and users
+    state_spaces = [ _ComponentStateSpace(component, statistics)
+                     for component in decomposition.components ]
+
+    # for each rule assigning the goal and each user (a query),
+    # split the rule preconditions among the components:
+    # each component condition is watched by the queries that contain it,
+    # and each query counts its conditions not satisfied yet
+    watchers: List[Dict[_Condition, List[int]]] = [ {} for _ in state_spaces ]
+    unsatisfied_count: List[int] = []
+    for rule in decomposition.goal_rules:
+        for user in arbac.user_list:
+            parts: Dict[int, Tuple[Optional[str], Set[str], Set[str]]] = {}
+            parts[decomposition.role_component[rule.admin_role]] = (rule.admin_role, set(), set())
+            for role in rule.positive_roles:
+                parts.setdefault(decomposition.role_component[role], (None, set(), set()))[1].add(role)
+            for role in rule.negative_roles:
+                parts.setdefault(decomposition.role_component[role], (None, set(), set()))[2].add(role)
+
+            query_index = len(unsatisfied_count)
+            unsatisfied_count.append(len(parts))
+            for component, (admin, positives, negatives) in parts.items():
+                condition = (admin, user, frozenset(positives), frozenset(negatives))
+                if condition not in watchers[component]:
+                    watchers[component][condition] = []
+                    state_spaces[component].add(condition)
+                watchers[component][condition].append(query_index)
+
+    # queries that can't be satisfied anymore, because some component
+    # got exhausted without satisfying its part
+    failed = [ False ] * len(unsatisfied_count)
+    failed_count = 0
+
+    # explore the components one state at a time, until a query is satisfied
+    # or all the queries have failed
+    while failed_count < len(unsatisfied_count):
+        for (component, state_space) in enumerate(state_spaces):
+            # nothing left to discover in this component
+            if state_space.exhausted or state_space.pending == 0:
+                continue
+
+            # the rule can fire for the user if each component satisfied its part
+            for condition in state_space.step():
+                for query_index in watchers[component].pop(condition):
+                    unsatisfied_count[query_index] -= 1
+                    if unsatisfied_count[query_index] == 0:
+                        return True
+
+            # the component got exhausted: its pending conditions will never be satisfied
+            if state_space.exhausted:
+                for query_indices in watchers[component].values():
+                    for query_index in query_indices:
+                        if not failed[query_index]:
+                            failed[query_index] = True
+                            failed_count += 1
+                watchers[component].clear()
+
+    return False
+
+
+def _to_state(user_to_role_assignment: UserToRoleAssignment) -> Tuple[FrozenSet[str], Dict[str, FrozenSet[str]]]:
+    """Converts a user-to-role assignment to a representation suitable for checking conditions.
+
+    Args:
+        user_to_role_assignment: The user-to-role assignment.
+
+    Returns:
+        A tuple (set of assigned roles, map from user to its roles).
+    """
+
+    user_roles: Dict[str, set] = {}
+    for user_role in user_to_role_assignment.user_role_list:
+        user_roles.setdefault(user_role.user, set()).add(user_role.role)
+
+    assigned_roles = frozenset(user_role.role for user_role in user_to_role_assignment.user_role_list)
+    return (assigned_roles, { user: frozenset(roles) for user, roles in user_roles.items() })
+
+
+def _satisfies(state: Tuple[FrozenSet[str], Dict[str, FrozenSet[str]]], condition: _Condition) -> bool:
+    """Checks if the component state satisfies the condition.
+
+    Args:
+        state: The component state, as returned by `_to_state`.
+        condition: The condition to check.
+
+    Returns:
+        True if the condition holds in the state, False otherwise.
+    """
+
+    (assigned_roles, user_roles) = state
+    (admin_role, user, positive_roles, negative_roles) = condition
+    target_user_roles = user_roles.get(user, frozenset())
+
+    return ((admin_role is None or admin_role in assigned_roles)
+            and positive_roles <= target_user_roles
+            and not (negative_roles & target_user_roles))
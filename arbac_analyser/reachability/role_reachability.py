@@ -1,24 +1,77 @@
 """ARBAC role reachability.
 
-This module exports only one function, `role_reachability`.
+This module exports 3 functions:
+- `role_reachability`;
+- `role_reachability_witness`;
+- `reachable_assignments`.
 
     Typical usage example:
 
     arbac_reachability = ArbacReachability(...)
     reachable = role_reachability(arbac_reachability)
     print("Reachable" if reachable else "Not reachable")
+
+    witness = role_reachability_witness(arbac_reachability)
+    if witness is not None:
+        for step in witness:
+            print(step.rule, step.user)
 """
 
 
-from typing import List, Set
+from array import array
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 from arbac_analyser.types.arbac import (
-    ArbacReachability, UserToRoleAssignment,
-    UserToRole, CanAssignRule, CanRevokeRule
+    Arbac, ArbacReachability, UserToRoleAssignment,
+    UserToRole, CanAssignRule, CanRevokeRule, WitnessStep, SearchStatistics
 )
 
 
-def role_reachability(arbac_reachability: ArbacReachability) -> bool:
+# kinds of rule
+_CAN_ASSIGN = 0
+_CAN_REVOKE = 1
+
+# firing of a rule on a user: (rule kind, rule index, target user)
+_Firing = Tuple[int, int, str]
+
+
+class _ParentPointers:
+    """Compact storage of the parent of each explored user-to-role assignment.
+
+    The user-to-role assignments are identified by their exploration order.
+    For each of them, the parent identifier and the firing that generated it
+    are stored in typed arrays, so that each assignment costs a small constant
+    number of bytes.
+    Can assign rules are encoded by their index i, can revoke rules by -(i + 1).
+
+    Attributes:
+        parents: Identifier of the parent of each assignment (-1 for the initial one).
+        rules: Encoded rule that generated each assignment.
+        users: Index of the target user of the rule that generated each assignment.
+    """
+
+    def __init__(self):
+        self.parents = array("l")
+        self.rules = array("l")
+        self.users = array("l")
+
+    def append(self, parent: int, rule: int, user: int):
+        """Stores the parent of the next explored assignment.
+
+        Args:
+            parent: Identifier of the parent assignment.
+            rule: Encoded rule that generated the assignment.
+            user: Index of the target user.
+        """
+
+        self.parents.append(parent)
+        self.rules.append(rule)
+        self.users.append(user)
+
+
+def role_reachability(arbac_reachability: ArbacReachability,
+                      statistics: Optional[SearchStatistics] = None) -> bool:
     """Solves the given ARBAC role reachability problem.
 
     Generates all the possible user-to-role assignment, checking if
@@ -26,6 +79,7 @@ def role_reachability(arbac_reachability: ArbacReachability) -> bool:
 
     Args:
         arbac_reachability: The ARBAC role reachability problem.
+        statistics: Statistics updated during the search (optional).
 
     Returns:
         A boolean indicating whether the goal role is reachable
@@ -33,143 +87,256 @@ def role_reachability(arbac_reachability: ArbacReachability) -> bool:
         policy.
     """
 
-    # queue of the user-to-role assignments that have still to be processed
-    to_process_queue: List[UserToRoleAssignment] = []
-    # set of the user-to-role assignments already processed
-    # set because it is faster than list when comes to searching
-    visited: Set[UserToRoleAssignment] = set()
+    # check if any user has the goal role, in any reachable user-to-role assignment
+    # (the generator stops as soon as the goal is reached)
+    return any(any(user_role.role == arbac_reachability.goal
+                   for user_role in user_to_role_assignment.user_role_list)
+               for user_to_role_assignment in reachable_assignments(arbac_reachability.arbac, statistics))
 
-    # add initial user-to-role assignment to the queue
-    to_process_queue.append(arbac_reachability.arbac.user_to_role_assignment)
 
-    # while queue is not empty
-    while to_process_queue:
-        # extract an user-to-role assignment from the queue
-        user_to_role_assignment = to_process_queue.pop(0)
+def role_reachability_witness(arbac_reachability: ArbacReachability,
+                              statistics: Optional[SearchStatistics] = None) -> Optional[List[WitnessStep]]:
+    """Solves the given ARBAC role reachability problem, returning a witness.
 
-        # if already visited, analyse the next in the queue
-        if user_to_role_assignment in visited:
-            continue
+    Explores the user-to-role assignments like `role_reachability`,
+    storing for each of them only a compact pointer to its parent,
+    and rebuilds the sequence of rules applied to reach the goal.
+    Since the exploration is breadth-first, the witness has minimal length.
 
-        # mark the user-to-role assignment as visited, by inserting it into the visited list
-        visited.add(user_to_role_assignment)
+    Args:
+        arbac_reachability: The ARBAC role reachability problem.
+        statistics: Statistics updated during the search (optional).
 
+    Returns:
+        The list of steps (rule and target user) that, applied in order
+        to the initial user-to-role assignment, assign the goal role to some user,
+        or None if the goal role is not reachable.
+    """
+
+    arbac = arbac_reachability.arbac
+    parent_pointers = _ParentPointers()
+
+    # assignments are yielded in exploration order, so their position is their identifier
+    for state_id, user_to_role_assignment in enumerate(_explore(arbac, parent_pointers, statistics)):
         # check if any user has the goal role
-        goal_reached = any(user_role.role == arbac_reachability.goal
-                           for user_role in user_to_role_assignment.user_role_list)
-
-        # if goal reached, just return True
-        if goal_reached:
-            return True
-
-        # generate all the possible new user-to-role assignments reachable from the current
-        # user-to-role assignment, using a single rule (can assign or can revoke) from the policy
-        # for all the user in the system
-
-        # for each can assign rule
-        for can_assign_rule in arbac_reachability.arbac.policy.can_assign:
-            # for each user
-            for user in arbac_reachability.arbac.user_list:
-                # try to execute the assignment and add the new user-to-role assignment to the queue
-                new_user_to_role_assignment = _assign(user_to_role_assignment, can_assign_rule, user)
-                # add it to the queue only if it is different from the parent one
-                if user_to_role_assignment != new_user_to_role_assignment:
-                    to_process_queue.append(new_user_to_role_assignment)
-
-        # for each can revoke rule
-        for can_revoke_rule in arbac_reachability.arbac.policy.can_revoke:
-            # for each user
-            for user in arbac_reachability.arbac.user_list:
-                # try to execute the revocation and add the new user-to-role assignment to the queue
-                new_user_to_role_assignment = _revoke(user_to_role_assignment, can_revoke_rule, user)
-                # add it to the queue only if it is different from the parent one
-                if user_to_role_assignment != new_user_to_role_assignment:
-                    to_process_queue.append(new_user_to_role_assignment)
-
-    return False
-
-
-def _assign(user_to_role_assignment: UserToRoleAssignment, can_assign_rule: CanAssignRule, target_user: str):
-    """Tries to apply the can assign rule to the target_user.
-
-    Condition to apply the can assign rule:
-    - a user with role can_assign_rule.admin_role is present in the user_to_role_assignment
-    - the target_user has all the can_assign_rule.positive_roles
-    - the target_user doesn't have any can_assign_rule.negative_roles
-    - the target_user doesn't already have the can_assign_rule.target_role
+        if any(user_role.role == arbac_reachability.goal
+               for user_role in user_to_role_assignment.user_role_list):
+
+            # follow the parent pointers back to the initial assignment
+            witness: List[WitnessStep] = []
+            while parent_pointers.parents[state_id] != -1:
+                rule_code = parent_pointers.rules[state_id]
+                if rule_code >= 0:
+                    rule = arbac.policy.can_assign[rule_code]
+                else:
+                    rule = arbac.policy.can_revoke[-rule_code - 1]
+                user = arbac.user_list[parent_pointers.users[state_id]]
+                witness.append(WitnessStep(rule, user))
+                state_id = parent_pointers.parents[state_id]
+
+            witness.reverse()
+            return witness
+
+    return None
+
+
+def reachable_assignments(arbac: Arbac,
+                          statistics: Optional[SearchStatistics] = None) -> Iterator[UserToRoleAssignment]:
+    """Generates all the user-to-role assignments reachable in the ARBAC system.
+
+    The assignments are explored in breadth-first order, starting from the
+    initial user-to-role assignment, and each of them is yielded exactly once.
+    Successors are generated lazily, so the caller can stop the exploration
+    as soon as it finds what it is looking for.
 
     Args:
-        user_to_role_assignment: The starting user-to-role assignment.
-        can_assign_rule: The can assign rule to apply.
-        target_user: The target user.
+        arbac: The ARBAC system.
+        statistics: Statistics updated during the exploration (optional).
 
-    Returns:
-        A new UserToRoleAssignment if all the can assign preconditions are met,
-        the input user_to_role_assignment otherwise.
+    Yields:
+        The reachable UserToRoleAssignment objects.
     """
 
-    # check if there is any user with the required admin role for firing the can_assign_rule
-    admin_present = any(user_role.role == can_assign_rule.admin_role
-                        for user_role in user_to_role_assignment.user_role_list)
+    return _explore(arbac, None, statistics)
 
-    # list of roles of the target user
-    target_user_roles = [ user_role.role
-                          for user_role in user_to_role_assignment.user_role_list
-                          if user_role.user == target_user ]
 
-    # check if the target_user has all the positive roles
-    positive_roles_present = all(pos_role in target_user_roles
-                                 for pos_role in can_assign_rule.positive_roles)
+def _explore(arbac: Arbac,
+             parent_pointers: Optional[_ParentPointers],
+             statistics: Optional[SearchStatistics]) -> Iterator[UserToRoleAssignment]:
+    """Explores the user-to-role assignments reachable in the ARBAC system.
 
-    # check if the target_user has any negative roles
-    negative_roles_present = any(neg_role in target_user_roles
-                                 for neg_role in can_assign_rule.negative_roles)
+    Each assignment carries the set of enabled firings (rule, user) of its parent,
+    together with the single user-to-role pair that differs from it:
+    only the firings that mention the changed role, or whose admin role
+    availability changed, are re-evaluated.
 
-    # check if the target user has already the target role
-    already_have_role = can_assign_rule.target_role in target_user_roles
+    Args:
+        arbac: The ARBAC system.
+        parent_pointers: Storage where the parent of each explored assignment
+            is recorded, in exploration order (None to not record parents).
+        statistics: Statistics updated during the exploration (optional).
 
-    if (admin_present
-        and positive_roles_present
-        and not negative_roles_present
-        and not already_have_role):
+    Yields:
+        The reachable UserToRoleAssignment objects, in breadth-first order.
+    """
 
-        # all conditions met: build and return the new user-to-role assignment
-        new_user_role_list = set(user_to_role_assignment.user_role_list)
-        new_user_role_list.add(UserToRole(target_user, can_assign_rule.target_role))
-        return UserToRoleAssignment(frozenset(new_user_role_list))
-    else:
-        # some conditions not met: return the old user-to-role assignment
-        return user_to_role_assignment
+    can_assign = arbac.policy.can_assign
+    can_revoke = arbac.policy.can_revoke
+    users = arbac.user_list
+    user_index = { user: i for i, user in enumerate(users) }
+
+    # index the rules by the roles they mention, in order to find
+    # the firings affected by a change in the user-to-role assignment
+    # (can assign rules mentioning the role as positive, negative, or target role,
+    # can revoke rules whose target is the role, and rules whose admin is the role)
+    can_assign_by_role: Dict[str, List[int]] = {}
+    can_assign_by_admin: Dict[str, List[int]] = {}
+    for i, rule in enumerate(can_assign):
+        for role in set(rule.positive_roles + rule.negative_roles + [ rule.target_role ]):
+            can_assign_by_role.setdefault(role, []).append(i)
+        can_assign_by_admin.setdefault(rule.admin_role, []).append(i)
+
+    can_revoke_by_target: Dict[str, List[int]] = {}
+    can_revoke_by_admin: Dict[str, List[int]] = {}
+    for i, rule in enumerate(can_revoke):
+        can_revoke_by_target.setdefault(rule.target_role, []).append(i)
+        can_revoke_by_admin.setdefault(rule.admin_role, []).append(i)
+
+    # queue of the user-to-role assignments that have still to be processed,
+    # each with the enabled firings of its parent and the changed user-to-role pair
+    # (None for the initial user-to-role assignment), the parent identifier,
+    # and the encoded rule and user index of the firing that generated it
+    to_process_queue: Deque[Tuple[UserToRoleAssignment, Optional[FrozenSet[_Firing]], Optional[UserToRole],
+                                  int, int, int]] = deque()
+    # set of the user-to-role assignments already processed
+    # set because it is faster than list when comes to searching
+    visited: Set[UserToRoleAssignment] = set()
 
+    # add initial user-to-role assignment to the queue
+    to_process_queue.append((arbac.user_to_role_assignment, None, None, -1, 0, -1))
 
-def _revoke(user_to_role_assignment: UserToRoleAssignment, can_revoke_rule: CanRevokeRule, target_user: str):
-    """Tries to apply the can revoke rule to the target_user.
+    # while queue is not empty
+    while to_process_queue:
+        # extract an user-to-role assignment from the queue
+        (user_to_role_assignment, parent_enabled, changed, parent_id, rule_code, rule_user) = to_process_queue.popleft()
 
-    Condition to apply the can revoke rule:
-    - a user with role can_revoke_rule.admin_role is present in the user_to_role_assignment
-    - the target_user has the can_revoke_rule.target_role
+        # if already visited, analyse the next in the queue
+        if user_to_role_assignment in visited:
+            continue
+
+        # mark the user-to-role assignment as visited, by inserting it into the visited list
+        visited.add(user_to_role_assignment)
+        state_id = len(visited) - 1
+
+        if statistics is not None:
+            statistics.explored_states += 1
+
+        # record how the user-to-role assignment has been reached
+        if parent_pointers is not None:
+            parent_pointers.append(parent_id, rule_code, rule_user)
+
+        yield user_to_role_assignment
+
+        # roles of each user, and number of users having each role
+        user_roles: Dict[str, Set[str]] = {}
+        role_count: Dict[str, int] = {}
+        for user_role in user_to_role_assignment.user_role_list:
+            user_roles.setdefault(user_role.user, set()).add(user_role.role)
+            role_count[user_role.role] = role_count.get(user_role.role, 0) + 1
+
+        if parent_enabled is None or changed is None:
+            # initial user-to-role assignment: evaluate all the firings
+            affected = set((kind, i, user)
+                           for (kind, rules) in ((_CAN_ASSIGN, can_assign), (_CAN_REVOKE, can_revoke))
+                           for i in range(len(rules))
+                           for user in users)
+            enabled: Set[_Firing] = set()
+        else:
+            # firings of the changed user, whose rules mention the changed role
+            affected = set((_CAN_ASSIGN, i, changed.user)
+                           for i in can_assign_by_role.get(changed.role, []))
+            affected.update((_CAN_REVOKE, i, changed.user)
+                            for i in can_revoke_by_target.get(changed.role, []))
+
+            # firings of all the users, if the changed role became available
+            # as admin role (first user having it) or unavailable (no user having it)
+            if role_count.get(changed.role, 0) <= 1:
+                affected.update((_CAN_ASSIGN, i, user)
+                                for i in can_assign_by_admin.get(changed.role, [])
+                                for user in users)
+                affected.update((_CAN_REVOKE, i, user)
+                                for i in can_revoke_by_admin.get(changed.role, [])
+                                for user in users)
+
+            enabled = set(parent_enabled)
+
+        # re-evaluate only the affected firings
+        for firing in affected:
+            if _enabled(firing, can_assign, can_revoke, user_roles, role_count):
+                enabled.add(firing)
+            else:
+                enabled.discard(firing)
+
+        frozen_enabled = frozenset(enabled)
+
+        # generate all the new user-to-role assignments reachable from the current one,
+        # by applying each enabled firing (sorted, to make the exploration order deterministic)
+        for (kind, i, user) in sorted(enabled):
+            if kind == _CAN_ASSIGN:
+                # assign the target role to the user
+                new_user_to_role = UserToRole(user, can_assign[i].target_role)
+                new_user_to_role_assignment = UserToRoleAssignment(
+                    user_to_role_assignment.user_role_list | frozenset([ new_user_to_role ])
+                )
+                new_rule_code = i
+            else:
+                # revoke the target role from the user
+                new_user_to_role = UserToRole(user, can_revoke[i].target_role)
+                new_user_to_role_assignment = UserToRoleAssignment(
+                    user_to_role_assignment.user_role_list - frozenset([ new_user_to_role ])
+                )
+                new_rule_code = -i - 1
+
+            if new_user_to_role_assignment not in visited:
+                to_process_queue.append((new_user_to_role_assignment, frozen_enabled, new_user_to_role,
+                                         state_id, new_rule_code, user_index[user]))
+
+
+def _enabled(firing: _Firing, can_assign: List[CanAssignRule], can_revoke: List[CanRevokeRule],
+             user_roles: Dict[str, Set[str]], role_count: Dict[str, int]) -> bool:
+    """Checks if the firing can be applied to the user-to-role assignment.
+
+    Condition to apply a can assign rule:
+    - a user with the rule admin role is present in the user-to-role assignment
+    - the target user has all the rule positive roles
+    - the target user doesn't have any rule negative roles
+    - the target user doesn't already have the rule target role
+
+    Condition to apply a can revoke rule:
+    - a user with the rule admin role is present in the user-to-role assignment
+    - the target user has the rule target role
 
     Args:
-        user_to_role_assignment: The starting user-to-role assignment.
-        can_revoke_rule: The can revoke rule to apply.
-        target_user: The target user.
+        firing: The firing (rule kind, rule index, target user).
+        can_assign: The can assign rules of the policy.
+        can_revoke: The can revoke rules of the policy.
+        user_roles: Map from each user to its roles in the user-to-role assignment.
+        role_count: Map from each role to the number of users having it.
 
     Returns:
-        A new UserToRoleAssignment if all the can revoke preconditions are met,
-        the input user_to_role_assignment otherwise.
+        True if all the rule preconditions are met, False otherwise.
     """
 
-    # check if there is any user with the required admin role for firing the can_revoke_rule
-    admin_present = any(user_role.role == can_revoke_rule.admin_role
-                        for user_role in user_to_role_assignment.user_role_list)
-
-    if admin_present:
-        # all conditions met: build and return the new user-to-role assignment
-        new_user_role_list = frozenset(filter(
-            lambda user_role: user_role.user != target_user or user_role.role != can_revoke_rule.target_role,
-            user_to_role_assignment.user_role_list
-        ))
-        return UserToRoleAssignment(new_user_role_list)
+    (kind, i, target_user) = firing
+    target_user_roles = user_roles.get(target_user, set())
+
+    if kind == _CAN_ASSIGN:
+        rule = can_assign[i]
+        return (role_count.get(rule.admin_role, 0) > 0
+                and all(role in target_user_roles for role in rule.positive_roles)
+                and not any(role in target_user_roles for role in rule.negative_roles)
+                and rule.target_role not in target_user_roles)
     else:
-        # some conditions not met: return the old user-to-role assignment
-        return user_to_role_assignment
+        rule = can_revoke[i]
+        return (role_count.get(rule.admin_role, 0) > 0
+                and rule.target_role in target_user_roles)
@@ -7,12 +7,14 @@ This module exports the following classes:
 - `CanRevokeRule`;
 - `Policy`;
 - `Arbac`;
-- `ArbacReachability`.
+- `ArbacReachability`;
+- `WitnessStep`;
+- `SearchStatistics`.
 """
 
 
 from dataclasses import dataclass
-from typing import List, FrozenSet
+from typing import List, FrozenSet, Union
 
 
 @dataclass(frozen=True)
@@ -118,3 +120,31 @@ class ArbacReachability:
 
     arbac: Arbac
     goal: str
+
+
+@dataclass
+class WitnessStep:
+    """Step of a witness of the role reachability problem.
+
+    Attributes:
+        rule: The applied rule (can assign or can revoke).
+        user: The target user (the one that gets assigned or
+            revocated the rule target role).
+    """
+
+    rule: Union[CanAssignRule, CanRevokeRule]
+    user: str
+
+
+@dataclass
+class SearchStatistics:
+    """Statistics of a role reachability search.
+
+    Attributes:
+        explored_states: Number of user-to-role assignments explored.
+        components: Number of independent components the problem has been
+            split into, and explored separately (0 if it has not been split).
+    """
+
+    explored_states: int = 0
+    components: int = 0